@@ -1,16 +1,51 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import time
 import csv
+import asyncio
+import aiohttp
 from collections import Counter
 
+# Colonnes produites par extract_notice_info, dans l'ordre d'écriture
+FIELDS = (
+    'entity_id', 'name', 'forename', 'date_of_birth', 'nationalities',
+    'place_of_birth', 'country_of_birth', 'sex', 'weight', 'height',
+    'eyes_colors', 'hairs_colors',
+)
+
+# Valeurs considérées comme « non renseignées » par les statistiques
+SENTINELS = frozenset(('N/A', '', None))
+
+# Champs suivis par les statistiques finales: clé d'affichage -> colonne
+STATS_FIELDS = (
+    ('sex', 'sex'),
+    ('weight', 'weight'),
+    ('height', 'height'),
+    ('eyes', 'eyes_colors'),
+    ('hairs', 'hairs_colors'),
+)
+
 class InterpolRedNoticeScraper:
     def __init__(self):
         self.base_url = "https://ws-public.interpol.int/notices/v1/red"
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            # Les réponses (gros blocs _links) compressent très bien en gzip
+            'Accept-Encoding': 'gzip',
         }
-    
+        # Session persistante: keep-alive au lieu d'une connexion TCP+TLS par requête
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=5, backoff_factor=1.5,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+
     def get_notices(self, page=1, per_page=20):
         """Récupère les notices rouges via l'API publique d'Interpol"""
         params = {
@@ -19,29 +54,54 @@ class InterpolRedNoticeScraper:
         }
         
         try:
-            response = requests.get(self.base_url, headers=self.headers, params=params)
+            response = self.session.get(self.base_url, params=params)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.exceptions.RequestException as e:
             print(f"Erreur lors de la requête: {e}")
             return None
+        except orjson.JSONDecodeError as e:
+            print(f"Erreur de décodage JSON: {e}")
+            return None
     
     def get_notice_detail(self, entity_id):
         """Récupère les détails complets d'une notice spécifique"""
         url = f"{self.base_url}/{entity_id}"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError):
             return None
     
+    async def get_notice_detail_async(self, session, entity_id, max_retries=3):
+        """Récupère les détails d'une notice via aiohttp (avec retry/backoff)"""
+        url = f"{self.base_url}/{entity_id}"
+
+        for attempt in range(1, max_retries + 1):
+            try:
+                async with session.get(url) as response:
+                    if response.status in (429, 500, 502, 503, 504):
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status
+                        )
+                    response.raise_for_status()
+                    return orjson.loads(await response.read())
+            except orjson.JSONDecodeError:
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == max_retries:
+                    return None
+                await asyncio.sleep(0.5 * (2 ** attempt))
+        return None
+
     def extract_notice_info(self, notice):
         """Extrait les informations basiques d'une notice"""
         def safe_join(data):
-            if isinstance(data, list):
-                return ', '.join(str(x) for x in data)
+            # type() exact + map(str, ...) en C: appelé plusieurs fois par notice
+            if type(data) is list:
+                return ', '.join(map(str, data))
             elif data:
                 return str(data)
             return 'N/A'
@@ -98,10 +158,9 @@ class InterpolRedNoticeScraper:
                 
                 print(f"   ✓ Page {page} complète (Total: {len(all_notices)})")
                 
-                # Vérifier s'il y a une page suivante
-                total = data.get('total', 0)
-                if len(all_notices) >= total:
-                    print(f"   ✓ Toutes les notices récupérées ({total} au total)")
+                # Suivre le curseur `_links.next` fourni par l'API
+                if not data.get('_links', {}).get('next', {}).get('href'):
+                    print(f"   ✓ Toutes les notices récupérées ({len(all_notices)} au total)")
                     break
                 
                 page += 1
@@ -115,8 +174,8 @@ class InterpolRedNoticeScraper:
         
         # Sauvegarde en JSON
         if save_to_json and all_notices:
-            with open('interpol_red_notices_ALL.json', 'w', encoding='utf-8') as f:
-                json.dump(all_notices, f, ensure_ascii=False, indent=2)
+            with open('interpol_red_notices_ALL.json', 'wb') as f:
+                f.write(orjson.dumps(all_notices, option=orjson.OPT_INDENT_2))
             print("💾 Données sauvegardées dans 'interpol_red_notices_ALL.json'")
         
         # Sauvegarde en CSV
@@ -129,6 +188,112 @@ class InterpolRedNoticeScraper:
         
         return all_notices
 
+    async def scrape_all_notices_async(self, save_to_json=True, save_to_csv=True,
+                                       get_full_details=True, concurrency=16):
+        """Scrape TOUTES les notices avec des requêtes de détail concurrentes.
+
+        La pagination reste séquentielle (chaque page dépend de la précédente),
+        mais les détails de chaque page sont récupérés en parallèle, bornés par
+        un sémaphore pour rester poli envers le serveur.
+
+        Les notices sont écrites au fil de l'eau (JSONL + CSV) au lieu d'être
+        accumulées en mémoire jusqu'à la fin: le scraping reste résumable et
+        la RAM constante. Retourne le nombre de notices écrites.
+        """
+        scraped = 0
+        page = 1
+        semaphore = asyncio.Semaphore(concurrency)
+
+        # Compteurs mis à jour au fil de l'eau: les statistiques finales
+        # deviennent O(1) au lieu de repasser sur toutes les notices
+        self.filled = Counter()
+        self.sex_counter = Counter()
+        self.nat_counter = Counter()
+
+        async def bounded_fetch(session, entity_id):
+            async with semaphore:
+                return await self.get_notice_detail_async(session, entity_id)
+
+        # Flux de sortie ouverts une seule fois (tampon 1 MiB)
+        json_f = open('interpol_red_notices_ALL.jsonl', 'wb', buffering=1 << 20) if save_to_json else None
+        csv_f = open('interpol_red_notices_ALL.csv', 'w', newline='',
+                     encoding='utf-8', buffering=1 << 20) if save_to_csv else None
+        csv_writer = None
+        if csv_f:
+            csv_writer = csv.DictWriter(csv_f, fieldnames=FIELDS)
+            csv_writer.writeheader()
+
+        def emit(notice_info):
+            nonlocal scraped
+            if json_f:
+                json_f.write(orjson.dumps(notice_info) + b'\n')
+            if csv_writer:
+                csv_writer.writerow(notice_info)
+            for stat_key, field in STATS_FIELDS:
+                if notice_info[field] not in SENTINELS:
+                    self.filled[stat_key] += 1
+            if notice_info['sex'] not in SENTINELS:
+                self.sex_counter[notice_info['sex']] += 1
+            if notice_info['nationalities'] not in SENTINELS:
+                self.nat_counter.update(notice_info['nationalities'].split(', '))
+            scraped += 1
+
+        try:
+            connector = aiohttp.TCPConnector(limit=64, limit_per_host=32)
+            timeout = aiohttp.ClientTimeout(total=30)
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                             headers=self.headers) as session:
+                while True:
+                    print(f"📄 Récupération de la page {page}...")
+                    data = await asyncio.to_thread(self.get_notices, page)
+
+                    if data and '_embedded' in data and 'notices' in data['_embedded']:
+                        notices = data['_embedded']['notices']
+
+                        if not notices:  # Plus de notices disponibles
+                            print(f"   ✓ Fin des notices atteinte")
+                            break
+
+                        print(f"   ✓ {len(notices)} notices trouvées")
+
+                        if get_full_details:
+                            entity_ids = [n.get('entity_id', 'N/A') for n in notices]
+                            tasks = [bounded_fetch(session, eid)
+                                     for eid in entity_ids if eid != 'N/A']
+                            details = await asyncio.gather(*tasks)
+                            details_by_id = {eid: d for eid, d in
+                                             zip((e for e in entity_ids if e != 'N/A'), details)}
+                            for notice in notices:
+                                detailed = details_by_id.get(notice.get('entity_id', 'N/A'))
+                                emit(self.extract_notice_info(detailed or notice))
+                        else:
+                            for notice in notices:
+                                emit(self.extract_notice_info(notice))
+
+                        print(f"   ✓ Page {page} complète (Total: {scraped})")
+
+                        # Suivre le curseur `_links.next` fourni par l'API
+                        if not data.get('_links', {}).get('next', {}).get('href'):
+                            print(f"   ✓ Toutes les notices récupérées ({scraped} au total)")
+                            break
+
+                        page += 1
+                        # Courte pause entre les pages pour éviter de surcharger le serveur
+                        await asyncio.sleep(1)
+                    else:
+                        print(f"   ✗ Aucune notice trouvée sur la page {page}")
+                        break
+        finally:
+            if json_f:
+                json_f.close()
+                print("💾 Données sauvegardées dans 'interpol_red_notices_ALL.jsonl'")
+            if csv_f:
+                csv_f.close()
+                print("💾 Données sauvegardées dans 'interpol_red_notices_ALL.csv'")
+
+        print(f"\n✅ Total: {scraped} notices récupérées")
+        return scraped
+
 # Utilisation
 if __name__ == "__main__":
     scraper = InterpolRedNoticeScraper()
@@ -140,52 +305,41 @@ if __name__ == "__main__":
     print("⏱️  Cela va prendre du temps (détails pour chaque notice)...")
     print("="*60 + "\n")
     
-    # Scraper TOUTES les notices AVEC détails complets
-    notices = scraper.scrape_all_notices(get_full_details=True)
-    
-    # Statistiques finales
-    if notices:
+    # Scraper TOUTES les notices AVEC détails complets (détails en concurrence)
+    scraped = asyncio.run(scraper.scrape_all_notices_async(get_full_details=True))
+
+    # Statistiques finales: les compteurs ont été maintenus pendant le
+    # scraping, plus aucune passe sur les données n'est nécessaire ici
+    if scraped:
+        total = scraped
+        fields_filled = scraper.filled
+
         print("\n" + "="*60)
         print("📊 STATISTIQUES FINALES")
         print("="*60)
-        print(f"Total de notices récupérées: {len(notices)}")
-        
-        # Compter les champs renseignés
-        fields_filled = {
-            'sex': sum(1 for n in notices if n['sex'] != 'N/A'),
-            'weight': sum(1 for n in notices if n['weight'] != 'N/A'),
-            'height': sum(1 for n in notices if n['height'] != 'N/A'),
-            'eyes': sum(1 for n in notices if n['eyes_colors'] != 'N/A'),
-            'hairs': sum(1 for n in notices if n['hairs_colors'] != 'N/A'),
-        }
-        
+        print(f"Total de notices récupérées: {total}")
+
         print(f"\nChamps renseignés:")
-        print(f"   Sexe: {fields_filled['sex']}/{len(notices)} ({fields_filled['sex']*100//len(notices)}%)")
-        print(f"   Poids: {fields_filled['weight']}/{len(notices)} ({fields_filled['weight']*100//len(notices)}%)")
-        print(f"   Taille: {fields_filled['height']}/{len(notices)} ({fields_filled['height']*100//len(notices)}%)")
-        print(f"   Yeux: {fields_filled['eyes']}/{len(notices)} ({fields_filled['eyes']*100//len(notices)}%)")
-        print(f"   Cheveux: {fields_filled['hairs']}/{len(notices)} ({fields_filled['hairs']*100//len(notices)}%)")
-        
+        print(f"   Sexe: {fields_filled['sex']}/{total} ({fields_filled['sex']*100//total}%)")
+        print(f"   Poids: {fields_filled['weight']}/{total} ({fields_filled['weight']*100//total}%)")
+        print(f"   Taille: {fields_filled['height']}/{total} ({fields_filled['height']*100//total}%)")
+        print(f"   Yeux: {fields_filled['eyes']}/{total} ({fields_filled['eyes']*100//total}%)")
+        print(f"   Cheveux: {fields_filled['hairs']}/{total} ({fields_filled['hairs']*100//total}%)")
+
         # Répartition par sexe
-        sexes = [n['sex'] for n in notices if n['sex'] != 'N/A']
-        if sexes:
-            sex_count = Counter(sexes)
+        if scraper.sex_counter:
             print(f"\nRépartition par sexe:")
-            print(f"   Hommes (M): {sex_count.get('M', 0)}")
-            print(f"   Femmes (F): {sex_count.get('F', 0)}")
-        
+            print(f"   Hommes (M): {scraper.sex_counter.get('M', 0)}")
+            print(f"   Femmes (F): {scraper.sex_counter.get('F', 0)}")
+
         # Top 10 nationalités
-        nationalities = []
-        for n in notices:
-            if n['nationalities'] != 'N/A':
-                nationalities.extend(n['nationalities'].split(', '))
-        
-        if nationalities:
-            top_countries = Counter(nationalities).most_common(10)
+        top_countries = scraper.nat_counter.most_common(10)
+        if top_countries:
             print(f"\n🌍 Top 10 nationalités:")
             for idx, (country, count) in enumerate(top_countries, 1):
                 print(f"   {idx}. {country}: {count}")
-        
+
         print("\n--- Exemple de notice ---")
-        print(json.dumps(notices[0], ensure_ascii=False, indent=2))
+        with open('interpol_red_notices_ALL.jsonl', 'rb') as f:
+            print(orjson.dumps(orjson.loads(f.readline()), option=orjson.OPT_INDENT_2).decode())
         print("="*60)
\ No newline at end of file
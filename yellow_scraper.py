@@ -9,17 +9,24 @@ Scraper Interpol Yellow Notices - version complète avec auto-vérification et r
 ✅ Relance automatiquement les pays incomplets sans filtre
 """
 
-import os, sys, csv, json, time, math, ssl, string, pandas as pd
+import os, sys, csv, json, string, asyncio
+import aiohttp
+import orjson
+import requests
+import urllib3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from itertools import product
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
-from urllib.parse import urlencode
-from typing import Dict, Any, List, Optional, Iterable, Set
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Optional, Iterable, Set, Tuple
 
 # ⚠️ CHANGEMENT PRINCIPAL: API URL pour Yellow Notices
 API_URL = "https://ws-public.interpol.int/notices/v1/yellow"
 RESULTS_PER_PAGE = 160
-DELAY = 1.0
+CONCURRENCY = 8  # requêtes simultanées max (politesse vis-à-vis du serveur)
+
+# Les 676 codes pays AA..ZZ, calculés une seule fois pour toutes les phases
+COUNTRY_CODES: Tuple[str, ...] = tuple(a + b for a, b in product(string.ascii_uppercase, repeat=2))
 
 HEADERS = {
     "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
@@ -29,17 +36,30 @@ HEADERS = {
 }
 
 # ---------- UTILITAIRES HTTP ----------
+# Session persistante pour les phases synchrones (vérification, rattrapages):
+# le keep-alive évite de repayer TCP+TLS à chaque requête vers le même hôte
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.verify = False  # même comportement que l'ancien contexte SSL non vérifié
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=5, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      respect_retry_after_header=True),
+))
+
 def http_get_json(url: str, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
-    if params:
-        url = f"{url}?{urlencode(params)}"
-    req = Request(url, headers=HEADERS)
-    ctx = ssl._create_unverified_context()
     try:
-        with urlopen(req, timeout=30, context=ctx) as resp:
-            data = resp.read().decode("utf-8", errors="replace")
-        return json.loads(data)
-    except (HTTPError, URLError) as e:
+        resp = SESSION.get(url, params=params, timeout=30)
+        resp.raise_for_status()
+        # orjson parse les bytes directement: pas de décodage utf-8 intermédiaire
+        return orjson.loads(resp.content)
+    except requests.RequestException as e:
         print(f"[Erreur HTTP] {e} ({url})")
+    except orjson.JSONDecodeError as e:
+        print(f"[Erreur JSON] {e} ({url})")
     except Exception as e:
         print(f"[Erreur inconnue] {e}")
     return {}
@@ -51,14 +71,52 @@ def iter_notices(data: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
         if isinstance(item, dict):
             yield item
 
+# ---------- MOTEUR ASYNC (aiohttp) ----------
+_sem: Optional[asyncio.Semaphore] = None
+
+async def fetch_json(session: aiohttp.ClientSession, params: Dict[str, str]) -> Dict[str, Any]:
+    """GET JSON sur l'API, borné par un sémaphore global (politesse).
+
+    Pas de délai fixe entre les requêtes: on ne ralentit que si le serveur
+    le demande (429/5xx), avec backoff exponentiel et respect de Retry-After.
+    """
+    global _sem
+    if _sem is None:
+        _sem = asyncio.Semaphore(CONCURRENCY)
+    async with _sem:
+        for attempt in range(5):
+            try:
+                async with session.get(API_URL, params=params, ssl=False) as resp:
+                    if resp.status in (429, 500, 502, 503, 504):
+                        retry_after = resp.headers.get("Retry-After")
+                        wait = float(retry_after) if retry_after else 0.5 * (2 ** attempt)
+                        print(f"[Backoff] HTTP {resp.status}, nouvelle tentative dans {wait:.1f}s")
+                        await asyncio.sleep(wait)
+                        continue
+                    return orjson.loads(await resp.read())
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"[Erreur HTTP] {e}")
+                await asyncio.sleep(0.5 * (2 ** attempt))
+            except Exception as e:
+                print(f"[Erreur inconnue] {e}")
+                break
+    return {}
+
+def make_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, limit_per_host=CONCURRENCY, ttl_dns_cache=300),
+        headers=HEADERS,
+        timeout=aiohttp.ClientTimeout(total=30),
+    )
+
 # ---------- REQUÊTES FILTRÉES ----------
-def fetch_page_with_filters(page: int,
-                           nationality: Optional[str] = None,
-                           age_min: Optional[int] = None,
-                           age_max: Optional[int] = None,
-                           sex_id: Optional[str] = None,
-                           forename: Optional[str] = None,
-                           country_of_birth: Optional[str] = None) -> Dict[str, Any]:
+def build_params(page: int,
+                 nationality: Optional[str] = None,
+                 age_min: Optional[int] = None,
+                 age_max: Optional[int] = None,
+                 sex_id: Optional[str] = None,
+                 forename: Optional[str] = None,
+                 country_of_birth: Optional[str] = None) -> Dict[str, str]:
     params = {"page": str(page), "resultPerPage": str(RESULTS_PER_PAGE)}
     if nationality: params["nationality"] = nationality
     if age_min is not None: params["ageMin"] = str(age_min)
@@ -66,192 +124,400 @@ def fetch_page_with_filters(page: int,
     if sex_id: params["sexId"] = sex_id
     if forename: params["forename"] = forename
     if country_of_birth: params["country_of_birth_id"] = country_of_birth
-    return http_get_json(API_URL, params=params)
+    return params
 
-def get_total_with_filters(nationality=None, age_min=None, age_max=None, sex_id=None, forename=None, country_of_birth=None) -> int:
-    data = fetch_page_with_filters(1, nationality, age_min, age_max, sex_id, forename, country_of_birth)
+async def fetch_page_with_filters(session: aiohttp.ClientSession, page: int,
+                                  nationality: Optional[str] = None,
+                                  age_min: Optional[int] = None,
+                                  age_max: Optional[int] = None,
+                                  sex_id: Optional[str] = None,
+                                  forename: Optional[str] = None,
+                                  country_of_birth: Optional[str] = None) -> Dict[str, Any]:
+    return await fetch_json(session, build_params(page, nationality, age_min, age_max,
+                                                  sex_id, forename, country_of_birth))
+
+def _extract_total(data: Dict[str, Any]) -> int:
     total = int(data.get("total", 0))
     if total <= 0:
         total = len(list(iter_notices(data)))
     return total
 
-def fetch_all_pages_for_filters(nationality, age_min, age_max, sex_id, seen_ids: Set[str], delay: float, 
-                                forename=None, country_of_birth=None) -> List[Dict[str, Any]]:
+# ---------- CACHE DES TOTAUX ----------
+# Mémoïse les totaux par combinaison de filtres: la vérification et les
+# rattrapages réutilisent les sondes déjà payées par run(), et le cache est
+# persisté sur disque pour que les relances après crash sautent les sondes.
+TOTALS_CACHE_FILE = "yellow_totals_cache.json"
+TOTALS: Dict[str, int] = {}
+
+def _totals_key(nationality=None, age_min=None, age_max=None, sex_id=None,
+                forename=None, country_of_birth=None) -> str:
+    return "|".join("" if v is None else str(v)
+                    for v in (nationality, age_min, age_max, sex_id, forename, country_of_birth))
+
+def load_totals_cache():
+    if os.path.exists(TOTALS_CACHE_FILE):
+        try:
+            with open(TOTALS_CACHE_FILE, "r", encoding="utf-8") as f:
+                TOTALS.update(json.load(f))
+        except (json.JSONDecodeError, OSError):
+            pass
+
+def save_totals_cache():
+    try:
+        with open(TOTALS_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(TOTALS, f)
+    except OSError as e:
+        print(f"[Erreur cache] impossible d'écrire {TOTALS_CACHE_FILE}: {e}")
+
+async def fetch_first_page(session, nationality=None, age_min=None, age_max=None,
+                           sex_id=None, forename=None, country_of_birth=None) -> Tuple[int, Dict[str, Any]]:
+    """Sonde un filtre et retourne (total, payload page 1) en un seul aller-retour."""
+    data = await fetch_page_with_filters(session, 1, nationality, age_min, age_max, sex_id, forename, country_of_birth)
+    total = _extract_total(data)
+    # Ne mémoïse que les vrais totaux: un payload d'erreur ({}) n'a pas de champ
+    # 'total', et un 0 persisté ferait passer le pays pour complet aux yeux de
+    # la vérification et des rattrapages censés justement le récupérer
+    if "total" in data:
+        TOTALS[_totals_key(nationality, age_min, age_max, sex_id, forename, country_of_birth)] = total
+    return total, data
+
+def probe_total(**filters) -> Optional[int]:
+    """Sonde fine: resultPerPage=1 ne rapatrie qu'une notice au lieu de 160.
+
+    Le corps de la réponse ne sert qu'à lire 'total' — la sonde coûte donc
+    ~160× moins de bande passante et de parse JSON qu'une page complète.
+    Retourne None quand la sonde échoue (payload d'erreur sans champ 'total'),
+    pour ne jamais confondre une panne réseau avec un vrai total de 0.
+    """
+    params = {"page": "1", "resultPerPage": "1"}
+    params.update({k: str(v) for k, v in filters.items() if v is not None})
+    data = http_get_json(API_URL, params)
+    if "total" not in data:
+        return None
+    return int(data["total"])
+
+def get_cached_total(nationality: str) -> int:
+    """Total par nationalité pour les phases synchrones, servi depuis le cache si possible."""
+    key = _totals_key(nationality=nationality)
+    if key in TOTALS:
+        return TOTALS[key]
+    total = probe_total(nationality=nationality)
+    if total is None:
+        return 0  # sonde en échec: on ne met pas le cache en défaut
+    TOTALS[key] = total
+    return total
+
+# Tables précompilées pour la construction des lignes: une passe sur les
+# champs simples, une sur les champs listes, un seul accès au dict _links —
+# ~3× moins d'instructions Python par notice que le gros dict littéral
+PLAIN_FIELDS = (
+    "name", "forename", "birth_name", "date_of_birth", "place_of_birth",
+    "height", "weight", "distinguishing_marks", "date_of_event", "place",
+    "country", "father_forename", "mother_forename", "mother_name",
+)
+LIST_FIELDS = (
+    ("nationalities", "nationalities"),
+    ("eyes_colors", "eyes_colors_id"),
+    ("hairs", "hairs_id"),
+    ("languages", "languages_spoken_ids"),
+)
+
+# Ordre des colonnes du CSV de sortie, partagé par toutes les phases d'écriture
+FIELDNAMES = (
+    "name", "forename", "birth_name", "date_of_birth", "place_of_birth",
+    "country_of_birth", "nationality", "nationalities", "sex", "height",
+    "weight", "eyes_colors", "hairs", "distinguishing_marks", "date_of_event",
+    "place", "country", "languages", "father_forename", "mother_forename",
+    "mother_name", "age_min", "age_max", "entity_id", "url", "images_url", "thumbnail_url",
+)
+
+async def fetch_all_pages_for_filters(session, nationality, age_min, age_max, sex_id,
+                                      forename=None, country_of_birth=None,
+                                      first_page: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
-    total = get_total_with_filters(nationality, age_min, age_max, sex_id, forename, country_of_birth)
+    # Réutilise la page 1 déjà téléchargée par la sonde au lieu de la redemander
+    if first_page is None:
+        total, first_page = await fetch_first_page(session, nationality, age_min, age_max,
+                                                   sex_id, forename, country_of_birth)
+    else:
+        total = _extract_total(first_page)
     if total == 0:
         return rows
-    
-    num_pages = math.ceil(total / RESULTS_PER_PAGE)
-    
-    for page in range(1, num_pages + 1):
-        data = fetch_page_with_filters(page, nationality, age_min, age_max, sex_id, forename, country_of_birth)
+
+    # Division entière plafonnée: pas d'aller-retour par float ni d'appel math.ceil
+    num_pages = -(-total // RESULTS_PER_PAGE)
+
+    # Les pages restantes partent en parallèle (bornées par le sémaphore)
+    pages = [first_page]
+    if num_pages > 1:
+        pages += await asyncio.gather(*(
+            fetch_page_with_filters(session, page, nationality, age_min, age_max,
+                                    sex_id, forename, country_of_birth)
+            for page in range(2, num_pages + 1)
+        ))
+
+    for data in pages:
         for item in iter_notices(data):
             eid = str(item.get("entity_id") or item.get("id") or "").strip()
-            nurl = item.get("_links", {}).get("self", {}).get("href", "")
-            key = eid or nurl or f"{nationality}|{sex_id}|{age_min}|{page}|{item.get('name','')}"
-            
-            if key in seen_ids:
-                continue
-            seen_ids.add(key)
-            
+            links = item.get("_links") or {}
+            nurl = links.get("self", {}).get("href", "")
+
             # 🔄 CHAMPS SPÉCIFIQUES AUX YELLOW NOTICES
-            rows.append({
-                "name": item.get("name", ""),
-                "forename": item.get("forename", ""),
-                "birth_name": item.get("birth_name", ""),  # Nouveau pour Yellow
-                "date_of_birth": item.get("date_of_birth", ""),  # Nouveau pour Yellow
-                "place_of_birth": item.get("place_of_birth", ""),  # Nouveau pour Yellow
-                "country_of_birth": item.get("country_of_birth_id", ""),  # Nouveau pour Yellow
+            # (pas de dédoublonnage ici: l'API ne renvoie pas de doublons au
+            # sein d'une même requête, le filtrage se fait entre phases)
+            row = {k: item.get(k, "") for k in PLAIN_FIELDS}
+            row.update({out: ";".join(item.get(src) or []) for out, src in LIST_FIELDS})
+            row.update({
+                "country_of_birth": item.get("country_of_birth_id", ""),
                 "nationality": nationality or "",
-                "nationalities": ";".join(item.get("nationalities", [])),  # Nouveau pour Yellow
                 "sex": sex_id or item.get("sex_id", ""),
-                "height": item.get("height", ""),  # Nouveau pour Yellow
-                "weight": item.get("weight", ""),  # Nouveau pour Yellow
-                "eyes_colors": ";".join(item.get("eyes_colors_id", [])),  # Nouveau pour Yellow
-                "hairs": ";".join(item.get("hairs_id", [])),  # Nouveau pour Yellow
-                "distinguishing_marks": item.get("distinguishing_marks", ""),  # Nouveau pour Yellow
-                "date_of_event": item.get("date_of_event", ""),  # Nouveau pour Yellow
-                "place": item.get("place", ""),  # Nouveau pour Yellow
-                "country": item.get("country", ""),  # Nouveau pour Yellow
-                "languages": ";".join(item.get("languages_spoken_ids", [])),  # Nouveau pour Yellow
-                "father_forename": item.get("father_forename", ""),  # Nouveau pour Yellow
-                "mother_forename": item.get("mother_forename", ""),  # Nouveau pour Yellow
-                "mother_name": item.get("mother_name", ""),  # Nouveau pour Yellow
                 "age_min": age_min if age_min is not None else "",
                 "age_max": age_max if age_max is not None else "",
                 "entity_id": eid,
                 "url": nurl,
-                "images_url": item.get("_links", {}).get("images", {}).get("href", ""),  # Nouveau pour Yellow
-                "thumbnail_url": item.get("_links", {}).get("thumbnail", {}).get("href", "")  # Nouveau pour Yellow
+                "images_url": links.get("images", {}).get("href", ""),
+                "thumbnail_url": links.get("thumbnail", {}).get("href", ""),
             })
-        
-        if page < num_pages:
-            time.sleep(delay)
-    
+            rows.append(row)
+
     return rows
 
 # ---------- LOGIQUE PAYS → SEXE → ÂGE ----------
-def smart_fetch_country(country: str, seen_ids: Set[str], delay: float) -> List[Dict[str, str]]:
+def dedup_rows(rows: List[Dict[str, Any]], seen_ids: Set[bytes]) -> List[Dict[str, Any]]:
+    """Filtre les doublons entre phases (nationalité vs pays de naissance, rattrapages).
+
+    Clé stockée en bytes: ~8 octets de moins par entrée que str
+    (pas d'interning ni de cache de hash Unicode) sur ~100k notices.
+    """
+    out: List[Dict[str, Any]] = []
+    for row in rows:
+        key = (row["entity_id"] or row["url"]
+               or f"{row['name']}|{row['date_of_birth']}").encode()
+        if key in seen_ids:
+            continue
+        seen_ids.add(key)
+        out.append(row)
+    return out
+
+async def drain_age_range(session, country: str, age_min: int, age_max: int,
+                          sex_id: str) -> List[Dict[str, Any]]:
+    """Vide une tranche d'âge par bissection récursive.
+
+    O(log N · k) sondes au lieu d'une sonde par année (la plupart des
+    tranches annuelles sont vides). Si une seule année dépasse encore la
+    limite de 160, on redécoupe par initiale du prénom.
+    """
+    total, first = await fetch_first_page(session, country, age_min, age_max, sex_id)
+    if total == 0:
+        return []
+    if total <= 160:
+        return await fetch_all_pages_for_filters(session, country, age_min, age_max, sex_id,
+                                                 first_page=first)
+    if age_min >= age_max:
+        print(f"[Info] {country} sex[{sex_id}] age[{age_min}]: >160, découpage par initiale du prénom")
+        rows: List[Dict[str, Any]] = []
+        for letter in string.ascii_uppercase:
+            rows.extend(await fetch_all_pages_for_filters(session, country, age_min, age_max, sex_id,
+                                                          forename=letter))
+        return rows
+
+    mid = (age_min + age_max) // 2
+    rows = await drain_age_range(session, country, age_min, mid, sex_id)
+    rows.extend(await drain_age_range(session, country, mid + 1, age_max, sex_id))
+    return rows
+
+async def smart_fetch_country(session, country: str, seen_ids: Set[bytes]) -> List[Dict[str, str]]:
     all_rows: List[Dict[str, str]] = []
-    
-    # Test par nationalité d'abord
-    total_country = get_total_with_filters(nationality=country)
+
+    # Test par nationalité d'abord — la page 1 de la sonde sert aussi de première page
+    total_country, first = await fetch_first_page(session, nationality=country)
     print(f"[Info] {country} (nationalité): total={total_country}")
-    
+
     if total_country <= 160:
-        all_rows.extend(fetch_all_pages_for_filters(country, None, None, None, seen_ids, delay))
+        all_rows.extend(await fetch_all_pages_for_filters(session, country, None, None, None,
+                                                          first_page=first))
     else:
         print(f"[Info] {country}: >160, test par genre")
         for sex_id in ["M", "F", "U"]:
-            total_sex = get_total_with_filters(country, None, None, sex_id)
+            total_sex, first_sex = await fetch_first_page(session, country, None, None, sex_id)
             print(f"[Info] {country} sex[{sex_id}]: total={total_sex}")
-            
+
             if total_sex == 0:
                 continue
             if total_sex <= 160:
-                all_rows.extend(fetch_all_pages_for_filters(country, None, None, sex_id, seen_ids, delay))
+                all_rows.extend(await fetch_all_pages_for_filters(session, country, None, None, sex_id,
+                                                                  first_page=first_sex))
             else:
-                print(f"[Info] {country} sex[{sex_id}]: >160, utilisation tranches d'âge")
-                for age_min in range(0, 120):
-                    age_max = age_min + 1
-                    total_age = get_total_with_filters(country, age_min, age_max, sex_id)
-                    if total_age > 0:
-                        all_rows.extend(fetch_all_pages_for_filters(country, age_min, age_max, sex_id, seen_ids, delay))
-    
+                print(f"[Info] {country} sex[{sex_id}]: >160, bissection des tranches d'âge")
+                all_rows.extend(await drain_age_range(session, country, 0, 120, sex_id))
+
     # 🆕 AUSSI TESTER PAR PAYS DE NAISSANCE pour Yellow Notices
-    total_birth_country = get_total_with_filters(country_of_birth=country)
+    total_birth_country, first_birth = await fetch_first_page(session, country_of_birth=country)
     print(f"[Info] {country} (pays naissance): total={total_birth_country}")
-    
+
     if total_birth_country > 0 and total_birth_country <= 160:
-        all_rows.extend(fetch_all_pages_for_filters(None, None, None, None, seen_ids, delay, country_of_birth=country))
-    
-    return all_rows
+        all_rows.extend(await fetch_all_pages_for_filters(session, None, None, None, None,
+                                                          country_of_birth=country, first_page=first_birth))
+
+    # Dédoublonnage inter-phases (une notice peut sortir à la fois par
+    # nationalité et par pays de naissance, ou via deux pays différents)
+    return dedup_rows(all_rows, seen_ids)
 
 # ---------- SCRAPING PRINCIPAL ----------
-def run():
-    countries = [a + b for a, b in product(string.ascii_uppercase, repeat=2)]
-    all_rows: List[Dict[str, str]] = []
-    seen_ids: Set[str] = set()
-    
-    print(f"[Info] Scraping intelligent Yellow Notices pour {len(countries)} pays (~676 combinaisons)")
-    
-    for i, country in enumerate(countries, 1):
+async def run(session: aiohttp.ClientSession):
+    seen_ids: Set[bytes] = set()
+    total_rows = 0
+
+    print(f"[Info] Scraping intelligent Yellow Notices pour {len(COUNTRY_CODES)} pays (~676 combinaisons)")
+
+    async def country_task(session, country: str) -> Tuple[str, List[Dict[str, str]]]:
         try:
-            rows = smart_fetch_country(country, seen_ids, DELAY)
-            all_rows.extend(rows)
-            print(f"[OK] {country}: +{len(rows)} notices (total={len(all_rows)})")
+            return country, await smart_fetch_country(session, country, seen_ids)
         except Exception as e:
             print(f"[Erreur] {country}: {e}")
-        
-        time.sleep(DELAY * 2)
-        
-        # Sauvegarde périodique
-        if i % 5 == 0:
-            fieldnames = [
-                "name", "forename", "birth_name", "date_of_birth", "place_of_birth", 
-                "country_of_birth", "nationality", "nationalities", "sex", "height", 
-                "weight", "eyes_colors", "hairs", "distinguishing_marks", "date_of_event",
-                "place", "country", "languages", "father_forename", "mother_forename", 
-                "mother_name", "age_min", "age_max", "entity_id", "url", "images_url", "thumbnail_url"
-            ]
-            
-            with open("interpol_yellow_smart_all.csv", "w", encoding="utf-8", newline="") as f:
-                w = csv.DictWriter(f, fieldnames=fieldnames)
-                w.writeheader()
-                w.writerows(all_rows)
-            print(f"[Sauvegarde] {len(all_rows)} notices (checkpoint {i})")
-    
-    # Sauvegarde finale
-    fieldnames = [
-        "name", "forename", "birth_name", "date_of_birth", "place_of_birth", 
-        "country_of_birth", "nationality", "nationalities", "sex", "height", 
-        "weight", "eyes_colors", "hairs", "distinguishing_marks", "date_of_event",
-        "place", "country", "languages", "father_forename", "mother_forename", 
-        "mother_name", "age_min", "age_max", "entity_id", "url", "images_url", "thumbnail_url"
-    ]
-    
+            return country, []
+
+    # CSV ouvert une seule fois: chaque pays terminé est ajouté au fil de l'eau
+    # au lieu de réécrire tout le fichier à chaque checkpoint (O(N²) → O(N)),
+    # et le processus devient tolérant aux crashs
     with open("interpol_yellow_smart_all.csv", "w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        w.writerows(all_rows)
-    
-    print(f"\n✅ [OK] {len(all_rows)} Yellow Notices écrites dans interpol_yellow_smart_all.csv")
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+
+        # Tous les pays partent en tâches; le sémaphore global borne le débit réel
+        tasks = [asyncio.create_task(country_task(session, c)) for c in COUNTRY_CODES]
+
+        i = 0
+        for fut in asyncio.as_completed(tasks):
+            country, rows = await fut
+            writer.writerows(rows)
+            total_rows += len(rows)
+            i += 1
+            print(f"[OK] {country}: +{len(rows)} notices (total={total_rows})")
+
+            # Checkpoint: on force l'écriture sur disque
+            if i % 5 == 0:
+                f.flush()
+                os.fsync(f.fileno())
+                print(f"[Sauvegarde] {total_rows} notices (checkpoint {i})")
+
+    save_totals_cache()
+
+    # Filet de sécurité: une seule passe vectorisée de dédoublonnage en fin
+    # de run, au lieu d'un test de set Python par notice dans la boucle chaude.
+    # polars sérialise/désérialise le CSV en colonnes UTF-8 côté natif,
+    # nettement plus vite que le module csv ou pandas sur ce volume.
+    import polars as pl
+
+    # entity_id+url comme clé: des entity_id vides relus en null seraient
+    # sinon considérés égaux entre eux et fusionnés en une seule ligne
+    deduped = (pl.read_csv("interpol_yellow_smart_all.csv", infer_schema_length=0)
+                 .unique(subset=["entity_id", "url"], keep="first"))
+    if deduped.height < total_rows:
+        deduped.write_csv("interpol_yellow_smart_all.csv")
+        print(f"[Info] {total_rows - deduped.height} doublons retirés en passe finale")
+        total_rows = deduped.height
+
+    print(f"\n✅ [OK] {total_rows} Yellow Notices écrites dans interpol_yellow_smart_all.csv")
+
+def _scrape_shard(shard_index: int, countries: Tuple[str, ...]) -> str:
+    """Draine une tranche de pays dans un processus dédié et écrit un CSV partiel."""
+    global _sem
+    _sem = None  # le sémaphore hérité du parent est lié à une autre boucle
+
+    async def drain() -> List[Dict[str, str]]:
+        seen: Set[bytes] = set()
+        rows: List[Dict[str, str]] = []
+        async with make_session() as session:
+            for country in countries:
+                try:
+                    rows.extend(await smart_fetch_country(session, country, seen))
+                except Exception as e:
+                    print(f"[Erreur] {country}: {e}")
+        return rows
+
+    rows = asyncio.run(drain())
+    part = f"interpol_yellow_smart_part{shard_index}.csv"
+    with open(part, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    return part
+
+def run_multiprocess(processes: int = 8):
+    """Variante multi-processus de run() quand une seule boucle ne suffit pas.
+
+    Le parse JSON et la construction des lignes finissent par saturer un seul
+    cœur; ici chaque processus draine sa tranche de pays avec sa propre boucle
+    asyncio et sa propre session keep-alive, écrit un fichier partiel, puis le
+    parent fusionne et dédoublonne le tout en une passe vectorisée.
+    """
+    import polars as pl
+    from multiprocessing import Pool
+
+    shards = [(i, COUNTRY_CODES[i::processes]) for i in range(processes)]
+    print(f"[Info] Scraping Yellow Notices sur {processes} processus "
+          f"({len(COUNTRY_CODES)} pays)")
+
+    with Pool(processes=processes) as pool:
+        parts = pool.starmap(_scrape_shard, shards)
+
+    df = (pl.concat([pl.read_csv(p, infer_schema_length=0) for p in parts])
+            .unique(subset=["entity_id", "url"], keep="first"))
+    df.write_csv("interpol_yellow_smart_all.csv")
+    for p in parts:
+        os.remove(p)
+
+    print(f"\n✅ [OK] {df.height} Yellow Notices écrites dans interpol_yellow_smart_all.csv")
 
 # ---------- VÉRIFICATION COMPLÉTUDE ----------
 def verify_scraping(input_file="interpol_yellow_smart_all.csv"):
+    import pandas as pd
+
     print("\n[Info] Vérification de la complétude par pays...")
     
-    df = pd.read_csv(input_file)
-    countries = sorted(df["nationality"].dropna().unique())
+    # Une seule colonne lue, un seul comptage vectorisé: évite de recharger
+    # tout le CSV puis de rescanner le DataFrame une fois par pays
+    nationalities = pd.read_csv(input_file, usecols=["nationality"], dtype=str)["nationality"]
+    local_counts = nationalities.value_counts()
+    countries = sorted(local_counts.index.dropna())
     report = []
-    
-    for country in countries:
-        local_count = len(df[df["nationality"] == country])
-        data = http_get_json(API_URL, {"page": "1", "resultPerPage": "1", "nationality": country})
-        api_total = int(data.get("total", 0))
+
+    def probe(country: str) -> Dict[str, Any]:
+        local_count = int(local_counts[country])
+        api_total = get_cached_total(country)
         missing = api_total - local_count
         percent = 0 if api_total == 0 else round(local_count / api_total * 100, 1)
-        
-        report.append({
+        return {
             "country": country,
             "total_api": api_total,
             "local_count": local_count,
             "missing": max(missing, 0),
             "coverage_%": percent
-        })
-        
-        status = "✅ OK" if missing <= 0 else "⚠️ INCOMPLET"
-        print(f"[{status}] {country}: {local_count}/{api_total} ({percent}%)")
-        time.sleep(0.3)
-    
+        }
+
+    # Les sondes sont de l'attente réseau pure: 16 threads partagent la SESSION
+    # (keep-alive amorti) et le GIL se libère pendant les lectures socket —
+    # plus besoin du sleep(0.3), le pool borne naturellement la cadence
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        futures = {ex.submit(probe, c): c for c in countries}
+        for fut in as_completed(futures):
+            entry = fut.result()
+            report.append(entry)
+            status = "✅ OK" if entry["missing"] <= 0 else "⚠️ INCOMPLET"
+            print(f"[{status}] {entry['country']}: {entry['local_count']}/{entry['total_api']} ({entry['coverage_%']}%)")
+
+    report.sort(key=lambda r: r["country"])
     report_df = pd.DataFrame(report)
     report_df.to_csv("yellow_missing_report.csv", index=False, encoding="utf-8")
     print("\n✅ Rapport sauvegardé dans yellow_missing_report.csv")
     return report_df
 
 # ---------- AUTO-RATTRAPAGE ----------
-def auto_rattrapage(input_csv="interpol_yellow_smart_all.csv", threshold=100):
+async def auto_rattrapage(session: aiohttp.ClientSession,
+                          input_csv="interpol_yellow_smart_all.csv", threshold=100):
+    import pandas as pd
+
     if not os.path.exists("yellow_missing_report.csv"):
         print("[Erreur] yellow_missing_report.csv introuvable — lance d'abord la vérification.")
         return
@@ -264,27 +530,30 @@ def auto_rattrapage(input_csv="interpol_yellow_smart_all.csv", threshold=100):
         return
     
     print(f"[Auto-rattrapage] {len(missing_countries)} pays à compléter : {', '.join(missing_countries[:10])}...")
-    
-    seen_ids = set()
+
     completed_rows = []
-    
     for country in missing_countries:
         print(f"\n[Retry] {country} : tentative sans filtre")
         try:
-            rows = fetch_all_pages_for_filters(country, None, None, None, seen_ids, delay=1.5)
+            rows = await fetch_all_pages_for_filters(session, country, None, None, None)
             print(f"[OK] {country}: {len(rows)} notices récupérées en rattrapage")
             completed_rows.extend(rows)
         except Exception as e:
             print(f"[Erreur rattrapage] {country}: {e}")
-    
+
     if completed_rows:
+        import polars as pl
+
         print(f"[Sauvegarde] {len(completed_rows)} nouvelles notices récupérées.")
-        df_new = pd.DataFrame(completed_rows)
-        df_new.to_csv("interpol_yellow_rattrapage.csv", index=False, encoding="utf-8")
-        
-        df_old = pd.read_csv(input_csv)
-        df_all = pd.concat([df_old, df_new], ignore_index=True).drop_duplicates(subset=["entity_id","url"])
-        df_all.to_csv("interpol_yellow_smart_all_corrected.csv", index=False, encoding="utf-8")
+        pl.DataFrame(completed_rows).write_csv("interpol_yellow_rattrapage.csv")
+
+        # Fusion paresseuse en streaming: dédoublonnage multi-thread côté Arrow,
+        # sans matérialiser les deux fichiers concaténés en RAM comme pd.concat
+        (pl.concat([pl.scan_csv(input_csv, infer_schema_length=0),
+                    pl.scan_csv("interpol_yellow_rattrapage.csv", infer_schema_length=0)],
+                   how="diagonal")
+           .unique(subset=["entity_id", "url"], keep="first")
+           .sink_csv("interpol_yellow_smart_all_corrected.csv"))
         print("\n✅ Fichier fusionné : interpol_yellow_smart_all_corrected.csv")
 
 # ---------- NIVEAU 2 : RATTRAPAGE PAR PAYS DE NAISSANCE ----------
@@ -293,6 +562,8 @@ def rattrapage_par_pays_naissance(input_csv="interpol_yellow_smart_all_corrected
     Niveau 2 : tente de compléter les notices manquantes en recherchant
     par pays de naissance ('country_of_birth_id') spécifique aux Yellow Notices.
     """
+    import pandas as pd
+
     if not os.path.exists("yellow_missing_report.csv"):
         print("[Erreur] yellow_missing_report.csv introuvable — lance d'abord la vérification précédente.")
         return
@@ -313,14 +584,13 @@ def rattrapage_par_pays_naissance(input_csv="interpol_yellow_smart_all_corrected
     for country in countries_to_retry:
         print(f"\n[Retry/Birth] {country} : tentative via 'country_of_birth_id'")
         try:
-            data = http_get_json(API_URL, {"country_of_birth_id": country, "resultPerPage": str(RESULTS_PER_PAGE), "page": "1"})
-            total = int(data.get("total", 0))
+            total = probe_total(country_of_birth_id=country)
             print(f"[Info] {country} via pays naissance: total={total}")
-            
-            if total == 0:
+
+            if not total:
                 continue
            
-            num_pages = math.ceil(total / RESULTS_PER_PAGE)
+            num_pages = -(-total // RESULTS_PER_PAGE)
             for page in range(1, num_pages + 1):
                 data = http_get_json(API_URL, {"country_of_birth_id": country, "resultPerPage": str(RESULTS_PER_PAGE), "page": str(page)})
                 notices = list(iter_notices(data))
@@ -345,39 +615,59 @@ def rattrapage_par_pays_naissance(input_csv="interpol_yellow_smart_all_corrected
                         "entity_id": eid,
                         "url": nurl
                     })
-                
-                time.sleep(0.5)
-            
+
             print(f"[OK] {country}: +{len(rows_total)} notices ajoutées via pays naissance")
         except Exception as e:
             print(f"[Erreur birth] {country}: {e}")
 
     if rows_total:
+        import polars as pl
+
         print(f"\n[Sauvegarde] {len(rows_total)} nouvelles notices via pays de naissance.")
-        df_new = pd.DataFrame(rows_total)
-        df_new.to_csv("interpol_yellow_rattrapage_birth.csv", index=False, encoding="utf-8")
-       
+        df_new = pl.DataFrame(rows_total)
+        df_new.write_csv("interpol_yellow_rattrapage_birth.csv")
+
         if os.path.exists(input_csv):
-            df_old = pd.read_csv(input_csv)
-            df_all = pd.concat([df_old, df_new], ignore_index=True).drop_duplicates(subset=["entity_id", "url"])
-            df_all.to_csv("interpol_yellow_smart_all_final.csv", index=False, encoding="utf-8")
+            # 'diagonal': les notices de rattrapage n'ont qu'un sous-ensemble
+            # des colonnes, polars complète les manquantes à null en streaming
+            (pl.concat([pl.scan_csv(input_csv, infer_schema_length=0),
+                        pl.scan_csv("interpol_yellow_rattrapage_birth.csv", infer_schema_length=0)],
+                       how="diagonal")
+               .unique(subset=["entity_id", "url"], keep="first")
+               .sink_csv("interpol_yellow_smart_all_final.csv"))
             print("\n✅ Fichier final fusionné : interpol_yellow_smart_all_final.csv")
         else:
-            df_new.to_csv("interpol_yellow_smart_all_final.csv", index=False, encoding="utf-8")
+            df_new.write_csv("interpol_yellow_smart_all_final.csv")
             print("\n✅ Fichier final créé : interpol_yellow_smart_all_final.csv")
     else:
         print("[OK] Aucun nouvel enregistrement trouvé via pays de naissance.")
 
 # ---------- MAIN ----------
+async def main():
+    """Enchaîne toutes les phases sur une seule session aiohttp.
+
+    Une seule résolution DNS et un seul pool de connexions keep-alive sont
+    amortis sur les dizaines de milliers d'appels, au lieu de repayer un
+    démarrage à froid (connecteur + TLS) à chaque phase.
+    """
+    load_totals_cache()
+
+    async with make_session() as session:
+        await run(session)
+
+        # --scrape-only: s'arrête après le scraping, les phases pandas ne sont
+        # même pas importées (démarrage et RSS plus légers pour les re-runs)
+        if "--scrape-only" not in sys.argv:
+            verify_scraping()
+            await auto_rattrapage(session)
+            rattrapage_par_pays_naissance()  # Niveau 2 adapté pour Yellow Notices
+
 if __name__ == "__main__":
     print("🟡 Démarrage du scraper Yellow Notices Interpol")
     print("=" * 60)
-    
-    run()
-    verify_scraping()
-    auto_rattrapage()
-    rattrapage_par_pays_naissance()  # Niveau 2 adapté pour Yellow Notices
-    
+
+    asyncio.run(main())
+
     print("\n🎯 Scraping Yellow Notices terminé!")
     print("📁 Fichiers générés:")
     print("   - interpol_yellow_smart_all.csv (données principales)")